@@ -1,11 +1,78 @@
 import os
 import time
-import json
+import base64
+import asyncio
+import threading
+import weakref
+import httpx
+import orjson
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional
 
 
-class MCPClient:
+# local config files, in priority order: absolute C: path, then workspace file
+_CONFIG_CANDIDATES = (
+    r"C:\central-mcp-config.json",
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "central-mcp-config.json")
+    ),
+)
+
+# cache-miss marker; None cannot be used because None results are cached
+_MISSING = object()
+
+# one httpx.AsyncClient per event loop: pooled connections belong to the loop that
+# opened them, so a client must not be reused after its loop is closed
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    # shared across AsyncMCPClient instances on the running loop; created on first use
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        # drop clients of finished loops; their connections may keep the loop alive
+        for old in [lp for lp in _async_clients if lp.is_closed()]:
+            del _async_clients[old]
+        client = _async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            http2=True,
+            timeout=5,
+        )
+    return client
+
+
+def _jwt_exp(token: str) -> Optional[float]:
+    # read the exp claim without verifying; only used to decide when to refresh
+    try:
+        seg = token.split(".")[1]
+        seg += "=" * (-len(seg) % 4)
+        return float(orjson.loads(base64.urlsafe_b64decode(seg))["exp"])
+    except Exception:
+        return None
+
+
+class _InflightCall:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class _BaseMCPClient:
     def __init__(
         self,
         url: Optional[str] = None,
@@ -15,119 +82,330 @@ class MCPClient:
         self.url = url or os.environ.get("CENTRAL_MCP_SERVER_URL")
         self.token = token or os.environ.get("CENTRAL_MCP_CLIENT_TOKEN")
         self.cache_ttl = cache_ttl
-        self._cache = {"data": None, "ts": 0}
+        # keyed by ("all",) / ("secret", name); misses (None) are cached too
+        self._cache = TTLCache(maxsize=128, ttl=cache_ttl, timer=time.monotonic)
+        self._base = self.url.rstrip("/") if self.url else None
+        self._local_cache = {}
+        # short-lived JWT from /token as (token, monotonic refresh deadline)
+        self._jwt = None
+        self._secrets = {}
+        self._view_local = None
+
+    def _cached_jwt(self):
+        # reuse the JWT until 30s before it expires
+        jwt = self._jwt
+        if jwt and time.monotonic() < jwt[1]:
+            return jwt[0]
+        return None
 
-    def _now(self):
-        return int(time.time())
+    def _store_jwt(self, payload):
+        token = payload.get("access_token")
+        if not token:
+            return None
+        expires_in = payload.get("expires_in")
+        if expires_in is None:
+            exp = _jwt_exp(token)
+            expires_in = exp - time.time() if exp is not None else None
+        if expires_in is not None:
+            self._jwt = (token, time.monotonic() + float(expires_in) - 30)
+        else:
+            self._jwt = None
+        return token
 
     def _read_local(self):
-        # prefer absolute C: path, then workspace file
-        candidates = [
-            r"C:\central-mcp-config.json",
-            os.path.join(
-                os.path.dirname(__file__), "..", "..", "central-mcp-config.json"
-            ),
-        ]
-        for p in candidates:
+        for p in _CONFIG_CANDIDATES:
+            try:
+                mtime = os.stat(p).st_mtime_ns
+            except OSError:
+                continue
+            # re-parse only when the file has changed since the last read
+            cached = self._local_cache.get(p)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
             try:
-                if os.path.exists(p):
-                    with open(p, "r", encoding="utf-8") as f:
-                        return json.load(f)
+                with open(p, "rb") as f:
+                    data = orjson.loads(f.read())
             except Exception:
                 continue
+            self._local_cache[p] = (mtime, data)
+            return data
         return None
 
-    def _fetch_remote(self):
-        if not self.url:
-            raise RuntimeError("MCP URL not configured")
-        headers = {}
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-        resp = requests.get(
-            self.url.rstrip("/") + "/context", headers=headers, timeout=5
-        )
-        resp.raise_for_status()
-        return resp.json()
-
-    def get_all(self):
-        if self._cache["data"] and (self._now() - self._cache["ts"]) < self.cache_ttl:
-            return self._cache["data"]
-        # 1) env vars starting with CENTRAL_
+    def _load_local_all(self):
+        # 1) env vars starting with CENTRAL_ (only runs on a get_all cache miss)
         env_obj = {k: v for k, v in os.environ.items() if k.startswith("CENTRAL_")}
         if env_obj:
-            self._cache = {"data": env_obj, "ts": self._now()}
             return env_obj
         # 2) local file
+        return self._read_local() or None
+
+    def _local_secrets(self):
+        # lookup table for the config file: "secrets" entries take priority over
+        # top-level keys; rebuilt only when the parsed config object changes
         local = self._read_local()
+        if local is not self._view_local:
+            view = {}
+            if isinstance(local, dict):
+                view.update((k, v) for k, v in local.items() if k != "secrets")
+                secrets = local.get("secrets")
+                if isinstance(secrets, dict):
+                    view.update(secrets)
+            self._secrets = view
+            self._view_local = local
+        return self._secrets
+
+    def _lookup_local_secret(self, name: str):
+        # 1) check environment directly
+        value = os.environ.get(name)
+        if value is None:
+            value = os.environ.get(name.upper())
+        if value is not None:
+            return value
+        # 2) check local config file
+        return self._local_secrets().get(name)
+
+
+class MCPClient(_BaseMCPClient):
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        token: Optional[str] = None,
+        cache_ttl: int = 30,
+    ):
+        super().__init__(url, token, cache_ttl)
+        self._cache_lock = threading.Lock()
+        self._inflight = {}
+        # one pooled session so repeat calls reuse keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if self.token:
+            self._session.headers["Authorization"] = f"Bearer {self.token}"
+
+    def close(self):
+        self._session.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _cached(self, key, loader):
+        with self._cache_lock:
+            value = self._cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InflightCall()
+        # only one thread loads a given key; the rest wait and share its result or error
+        if not leader:
+            return call.wait()
+        try:
+            value, cacheable = loader()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            call.value = value
+            if cacheable:
+                with self._cache_lock:
+                    self._cache[key] = value
+            return value
+        finally:
+            with self._cache_lock:
+                del self._inflight[key]
+            call.event.set()
+
+    def _fetch_remote(self):
+        if not self.url:
+            raise RuntimeError("MCP URL not configured")
+        resp = self._session.get(self._base + "/context", timeout=5)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
+    def _load_all(self):
+        local = self._load_local_all()
         if local:
-            self._cache = {"data": local, "ts": self._now()}
             return local
         # 3) remote
-        remote = self._fetch_remote()
-        self._cache = {"data": remote, "ts": self._now()}
-        return remote
+        return self._fetch_remote()
+
+    def get_all(self):
+        return self._cached(("all",), lambda: (self._load_all(), True))
 
     def get(self, key: str):
         allcfg = self.get_all()
         return allcfg.get(key) if allcfg else None
 
-    def get_secret(self, name: str):
-        # 1) check environment directly
-        if name in os.environ:
-            return os.environ[name]
-        env_key = name.upper()
-        if env_key in os.environ:
-            return os.environ[env_key]
-
-        # 2) check local config file
-        local = self._read_local()
-        if local:
-            if isinstance(local, dict):
-                if "secrets" in local and name in local["secrets"]:
-                    return local["secrets"][name]
-                if name in local:
-                    return local[name]
+    def _load_secret(self, name: str):
+        # returns (value, cacheable); a miss is only cacheable when it is definite
+        # (no remote configured, or the server answered 404), never after an error
+        value = self._lookup_local_secret(name)
+        if value is not None:
+            return value, True
 
         # 3) try remote: first try direct token (server token) then try obtaining short-lived JWT
-        if not self.url:
-            return None
-        headers = {}
+        if not self.url or not self.token:
+            return None, True
         # try direct token (may be server token)
-        if self.token:
-            headers["Authorization"] = f"Bearer {self.token}"
-            try:
-                r = requests.get(
-                    self.url.rstrip("/") + f"/secrets/{name}",
-                    headers=headers,
+        try:
+            r = self._session.get(self._base + f"/secrets/{name}", timeout=5)
+            if r.status_code == 200:
+                return orjson.loads(r.content).get("value"), True
+            if r.status_code == 404:
+                return None, True
+        except Exception:
+            pass
+
+        # try obtain short-lived JWT (cached until shortly before it expires)
+        try:
+            token = self._cached_jwt()
+            if token is None:
+                t = self._session.post(self._base + "/token", timeout=5)
+                if t.status_code == 200:
+                    token = self._store_jwt(orjson.loads(t.content))
+            if token:
+                hdr2 = {"Authorization": f"Bearer {token}"}
+                r2 = self._session.get(
+                    self._base + f"/secrets/{name}",
+                    headers=hdr2,
                     timeout=5,
                 )
-                if r.status_code == 200:
-                    return r.json().get("value")
-            except Exception:
-                pass
+                if r2.status_code == 200:
+                    return orjson.loads(r2.content).get("value"), True
+                if r2.status_code == 404:
+                    return None, True
+                if r2.status_code in (401, 403):
+                    self._jwt = None
+        except Exception:
+            pass
+
+        return None, False
+
+    def get_secret(self, name: str):
+        return self._cached(("secret", name), lambda: self._load_secret(name))
 
-        # try obtain short-lived JWT
+
+class AsyncMCPClient(_BaseMCPClient):
+    """Non-blocking variant of MCPClient for use inside async handlers."""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        token: Optional[str] = None,
+        cache_ttl: int = 30,
+    ):
+        super().__init__(url, token, cache_ttl)
+        self._headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        self._inflight = {}
+
+    @property
+    def _client(self) -> httpx.AsyncClient:
+        return _get_async_client()
+
+    async def _cached(self, key, loader):
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        # concurrent callers for the same key share a single in-flight load
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fill(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _fill(self, key, loader):
+        value, cacheable = await loader()
+        if cacheable:
+            self._cache[key] = value
+        return value
+
+    async def _fetch_remote(self):
+        if not self.url:
+            raise RuntimeError("MCP URL not configured")
+        resp = await self._client.get(self._base + "/context", headers=self._headers)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+
+    async def _load_all(self):
+        local = self._load_local_all()
+        if local:
+            return local
+        # 3) remote
+        return await self._fetch_remote()
+
+    async def get_all(self):
+        return await self._cached(("all",), self._load_all_entry)
+
+    async def _load_all_entry(self):
+        return await self._load_all(), True
+
+    async def get(self, key: str):
+        allcfg = await self.get_all()
+        return allcfg.get(key) if allcfg else None
+
+    async def _load_secret(self, name: str):
+        # returns (value, cacheable); see MCPClient._load_secret
+        value = self._lookup_local_secret(name)
+        if value is not None:
+            return value, True
+
+        # 3) try remote: first try direct token (server token) then try obtaining short-lived JWT
+        if not self.url or not self.token:
+            return None, True
         try:
-            if self.token:
-                hdr = {"Authorization": f"Bearer {self.token}"}
-                t = requests.post(
-                    self.url.rstrip("/") + "/token", headers=hdr, timeout=5
-                )
+            r = await self._client.get(
+                self._base + f"/secrets/{name}", headers=self._headers
+            )
+            if r.status_code == 200:
+                return orjson.loads(r.content).get("value"), True
+            if r.status_code == 404:
+                return None, True
+        except Exception:
+            pass
+
+        try:
+            token = self._cached_jwt()
+            if token is None:
+                t = await self._client.post(self._base + "/token", headers=self._headers)
                 if t.status_code == 200:
-                    token = t.json().get("access_token")
-                    if token:
-                        hdr2 = {"Authorization": f"Bearer {token}"}
-                        r2 = requests.get(
-                            self.url.rstrip("/") + f"/secrets/{name}",
-                            headers=hdr2,
-                            timeout=5,
-                        )
-                        if r2.status_code == 200:
-                            return r2.json().get("value")
+                    token = self._store_jwt(orjson.loads(t.content))
+            if token:
+                r2 = await self._client.get(
+                    self._base + f"/secrets/{name}",
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                if r2.status_code == 200:
+                    return orjson.loads(r2.content).get("value"), True
+                if r2.status_code == 404:
+                    return None, True
+                if r2.status_code in (401, 403):
+                    self._jwt = None
         except Exception:
             pass
 
-        return None
+        return None, False
+
+    async def get_secret(self, name: str):
+        return await self._cached(("secret", name), lambda: self._load_secret(name))
+
+
+async def aclose_shared_client():
+    # call from the app's shutdown hook, on the loop the clients were used on
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+from mcp_client import AsyncMCPClient, MCPClient
+
+N = 8
+
+
+def _offline_client(cls):
+    c = cls(url="http://mcp.invalid", token="t", cache_ttl=30)
+    # force every get_all miss onto the (stubbed) remote path
+    c._load_local_all = lambda: None
+    return c
+
+
+def _run_threads(c, started, release):
+    errors, results = [], []
+
+    def call():
+        try:
+            results.append(c.get_all())
+        except Exception as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    assert started.wait(5)
+    waiters = [threading.Thread(target=call) for _ in range(N - 1)]
+    for t in waiters:
+        t.start()
+    # give the waiters time to find the in-flight call before the leader finishes
+    time.sleep(0.2)
+    release.set()
+    for t in [leader, *waiters]:
+        t.join(5)
+    return errors, results
+
+
+def test_sync_get_all_shares_leader_error():
+    c = _offline_client(MCPClient)
+    calls, started, release = [], threading.Event(), threading.Event()
+    boom = RuntimeError("remote down")
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        raise boom
+
+    c._fetch_remote = fetch
+    errors, results = _run_threads(c, started, release)
+    assert len(calls) == 1
+    assert results == []
+    assert len(errors) == N and all(e is boom for e in errors)
+    assert c._inflight == {}
+    # failures are not cached: the next call loads again
+    c._fetch_remote = lambda: {"k": "v"}
+    assert c.get("k") == "v"
+
+
+def test_sync_get_all_shares_leader_result():
+    c = _offline_client(MCPClient)
+    calls, started, release = [], threading.Event(), threading.Event()
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"k": "v"}
+
+    c._fetch_remote = fetch
+    errors, results = _run_threads(c, started, release)
+    assert len(calls) == 1
+    assert errors == []
+    assert len(results) == N and all(r == {"k": "v"} for r in results)
+    assert c._inflight == {}
+
+
+def test_async_get_all_shares_leader_error():
+    c = _offline_client(AsyncMCPClient)
+    calls = []
+    boom = RuntimeError("remote down")
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        raise boom
+
+    c._fetch_remote = fetch
+
+    async def main():
+        return await asyncio.gather(
+            *[c.get_all() for _ in range(N)], return_exceptions=True
+        )
+
+    outcomes = asyncio.run(main())
+    assert len(calls) == 1
+    assert len(outcomes) == N and all(o is boom for o in outcomes)
+    assert c._inflight == {}
+
+
+def test_async_get_all_shares_leader_result():
+    c = _offline_client(AsyncMCPClient)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"k": "v"}
+
+    c._fetch_remote = fetch
+
+    async def main():
+        return await asyncio.gather(*[c.get_all() for _ in range(N)])
+
+    assert asyncio.run(main()) == [{"k": "v"}] * N
+    assert len(calls) == 1
+    assert c._inflight == {}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print("ok", name)
@@ -1,9 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+import orjson
 import uvicorn
 from typing import List, Optional
+import asyncio
 import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 # Import models and services
@@ -27,7 +34,8 @@ app = FastAPI(
     description="API สำหรับการคำนวณการรับน้ำหนักของคานทางวิศวกรรมโยธา",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -35,46 +43,168 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # React dev server
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
+# Number of uvicorn worker processes serving this app (the variable uvicorn itself reads)
+WEB_WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+
 # Initialize services
-beam_calculator = BeamCalculator()
 validation_service = ValidationService()
 
+# Beam analysis is CPU-bound, so it runs in a process pool instead of the event loop.
+# Each worker process keeps its own calculator instance.
+_worker_calculator: Optional[BeamCalculator] = None
+
+def _run_beam_analysis(request: AnalysisRequest) -> str:
+    """คำนวณคานใน worker process (คืนผลเป็น JSON เพื่อให้ส่งข้ามโปรเซสได้)"""
+    global _worker_calculator
+    if _worker_calculator is None:
+        _worker_calculator = BeamCalculator()
+    results = asyncio.run(_worker_calculator.analyze_beam(request))
+    # serialize here so the parent process only forwards the JSON
+    return results.model_dump_json()
+
+@app.on_event("startup")
+async def start_process_pool():
+    # share the cores between uvicorn workers instead of giving each a full pool
+    app.state.pool = ProcessPoolExecutor(
+        max_workers=max(1, (os.cpu_count() or 1) // WEB_WORKERS)
+    )
+
+@app.on_event("shutdown")
+async def stop_process_pool():
+    app.state.pool.shutdown(wait=False, cancel_futures=True)
+
+# Static responses are serialized once at import time
+_ROOT_BYTES = orjson.dumps({
+    "message": "Engineering Web Application API",
+    "docs": "/docs",
+    "health": "/health"
+})
+
+_BEAM_TYPES_BYTES = orjson.dumps({
+    "beam_types": [
+        {
+            "id": "simply-supported",
+            "name": "Simply Supported Beam",
+            "description": "คานรองรับแบบง่าย (Pin-Roller)",
+            "supports_required": 2
+        },
+        {
+            "id": "cantilever",
+            "name": "Cantilever Beam",
+            "description": "คานยื่น (Fixed-Free)",
+            "supports_required": 1
+        },
+        {
+            "id": "fixed-fixed",
+            "name": "Fixed-Fixed Beam",
+            "description": "คานยึดแน่นทั้งสองปลาย",
+            "supports_required": 2
+        }
+    ]
+})
+
+_MATERIALS_BYTES = orjson.dumps({
+    "materials": [
+        {
+            "name": "Steel (A36)",
+            "elastic_modulus": 200e9,  # Pa
+            "density": 7850,  # kg/m³
+            "yield_strength": 250e6  # Pa
+        },
+        {
+            "name": "Concrete (C25/30)",
+            "elastic_modulus": 31e9,  # Pa
+            "density": 2400,  # kg/m³
+            "yield_strength": 25e6  # Pa
+        },
+        {
+            "name": "Aluminum (6061-T6)",
+            "elastic_modulus": 69e9,  # Pa
+            "density": 2700,  # kg/m³
+            "yield_strength": 276e6  # Pa
+        },
+        {
+            "name": "Wood (Douglas Fir)",
+            "elastic_modulus": 13e9,  # Pa
+            "density": 500,  # kg/m³
+            "yield_strength": 40e6  # Pa
+        }
+    ]
+})
+
+# Current time as an ISO string, formatted at most once per second: (epoch second, iso)
+_now_iso = (0, "")
+
+def iso_now() -> str:
+    global _now_iso
+    now = int(time.time())
+    if _now_iso[0] != now:
+        _now_iso = (now, datetime.fromtimestamp(now).isoformat())
+    return _now_iso[1]
+
+# /health body, rebuilt at most once per second: (iso timestamp, bytes)
+_health_cache = ("", b"")
+
 # Health check endpoint
-@app.get("/health")
+@app.get("/health", response_model=None)
 async def health_check():
     """ตรวจสอบสถานะของ API"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "version": "1.0.0"
-    }
+    global _health_cache
+    timestamp = iso_now()
+    if _health_cache[0] != timestamp:
+        _health_cache = (timestamp, orjson.dumps({
+            "status": "healthy",
+            "timestamp": timestamp,
+            "version": "1.0.0"
+        }))
+    return Response(content=_health_cache[1], media_type="application/json")
 
 # Root endpoint
-@app.get("/")
+@app.get("/", response_model=None)
 async def root():
     """หน้าแรกของ API"""
-    return {
-        "message": "Engineering Web Application API",
-        "docs": "/docs",
-        "health": "/health"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 # Beam analysis endpoint
-@app.post("/api/analyze", response_model=AnalysisResults)
-async def analyze_beam(request: AnalysisRequest):
+# The body is decoded straight from bytes by pydantic-core instead of going through
+# json.loads + dict validation; the schema is still published for /docs.
+@app.post(
+    "/api/analyze",
+    response_model=None,
+    responses={200: {"model": AnalysisResults}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": "#/components/schemas/AnalysisRequest"}
+                }
+            }
+        }
+    }
+)
+async def analyze_beam(raw_request: Request):
     """
     คำนวณการรับน้ำหนักของคาน
     
     Args:
-        request: ข้อมูลคาน, การรองรับ, และแรงกระทำ
+        raw_request: HTTP request ที่มี AnalysisRequest (ข้อมูลคาน, การรองรับ, และแรงกระทำ) เป็น JSON
     
     Returns:
         ผลการคำนวณรวมถึงกราฟและค่าสำคัญต่างๆ
     """
+    body = await raw_request.body()
+    try:
+        request = AnalysisRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in e.errors()]
+        )
+    
     try:
         logger.info(f"Starting beam analysis for request ID: {request.id}")
         
@@ -90,10 +220,15 @@ async def analyze_beam(request: AnalysisRequest):
             )
         
         # Perform beam analysis
-        results = await beam_calculator.analyze_beam(request)
+        loop = asyncio.get_running_loop()
+        results_json = await loop.run_in_executor(
+            app.state.pool, _run_beam_analysis, request
+        )
         
         logger.info(f"Beam analysis completed for request ID: {request.id}")
-        return results
+        # the worker already serialized the validated AnalysisResults; return the JSON
+        # as-is rather than letting FastAPI re-validate it against response_model
+        return Response(content=results_json, media_type="application/json")
         
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
@@ -103,67 +238,19 @@ async def analyze_beam(request: AnalysisRequest):
         raise HTTPException(status_code=500, detail="Internal calculation error")
 
 # Get supported beam types
-@app.get("/api/beam-types")
+@app.get("/api/beam-types", response_model=None)
 async def get_beam_types():
     """รายการประเภทคานที่รองรับ"""
-    return {
-        "beam_types": [
-            {
-                "id": "simply-supported",
-                "name": "Simply Supported Beam",
-                "description": "คานรองรับแบบง่าย (Pin-Roller)",
-                "supports_required": 2
-            },
-            {
-                "id": "cantilever",
-                "name": "Cantilever Beam",
-                "description": "คานยื่น (Fixed-Free)",
-                "supports_required": 1
-            },
-            {
-                "id": "fixed-fixed",
-                "name": "Fixed-Fixed Beam",
-                "description": "คานยึดแน่นทั้งสองปลาย",
-                "supports_required": 2
-            }
-        ]
-    }
+    return Response(content=_BEAM_TYPES_BYTES, media_type="application/json")
 
 # Get material properties
-@app.get("/api/materials")
+@app.get("/api/materials", response_model=None)
 async def get_materials():
     """รายการคุณสมบัติวัสดุมาตรฐาน"""
-    return {
-        "materials": [
-            {
-                "name": "Steel (A36)",
-                "elastic_modulus": 200e9,  # Pa
-                "density": 7850,  # kg/m³
-                "yield_strength": 250e6  # Pa
-            },
-            {
-                "name": "Concrete (C25/30)",
-                "elastic_modulus": 31e9,  # Pa
-                "density": 2400,  # kg/m³
-                "yield_strength": 25e6  # Pa
-            },
-            {
-                "name": "Aluminum (6061-T6)",
-                "elastic_modulus": 69e9,  # Pa
-                "density": 2700,  # kg/m³
-                "yield_strength": 276e6  # Pa
-            },
-            {
-                "name": "Wood (Douglas Fir)",
-                "elastic_modulus": 13e9,  # Pa
-                "density": 500,  # kg/m³
-                "yield_strength": 40e6  # Pa
-            }
-        ]
-    }
+    return Response(content=_MATERIALS_BYTES, media_type="application/json")
 
 # Validate beam configuration
-@app.post("/api/validate")
+@app.post("/api/validate", response_model=None)
 async def validate_beam_config(request: AnalysisRequest):
     """
     ตรวจสอบความถูกต้องของการกำหนดค่าคาน
@@ -191,32 +278,41 @@ async def validate_beam_config(request: AnalysisRequest):
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
             "message": exc.detail,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": True,
             "message": "Internal server error",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now()
         }
     )
 
 if __name__ == "__main__":
+    # DEV=1 enables auto-reload, which uvicorn only supports with a single worker.
+    # loop/http "auto" use uvloop/httptools when installed (uvloop is unavailable on Windows)
+    dev = os.environ.get("DEV") == "1"
+    workers = 1 if dev else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    # worker processes re-import this module and size their pools from it
+    os.environ["WEB_CONCURRENCY"] = str(workers)
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        reload=dev,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level="info" if dev else "warning"
     )
\ No newline at end of file
@@ -15,6 +15,7 @@ from .beam_models import (
     MomentLoad,
     Load,
     DataPoint,
+    DataSeries,
     Reaction,
     CriticalPoint,
     SafetyAnalysis,
@@ -38,6 +39,7 @@ __all__ = [
     'MomentLoad',
     'Load',
     'DataPoint',
+    'DataSeries',
     'Reaction',
     'CriticalPoint',
     'SafetyAnalysis',
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Union, Literal
+from pydantic import (
+    BaseModel, Discriminator, Field, Tag, ValidationInfo, field_validator, model_validator
+)
+from pydantic.dataclasses import dataclass
+from typing import Annotated, List, Optional, Union, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -41,23 +44,16 @@ class CrossSection(BaseModel):
     diameter: Optional[float] = Field(None, gt=0, description="เส้นผ่านศูนย์กลาง (m)")
     custom_properties: Optional[dict] = None
     
-    @validator('width')
-    def validate_width(cls, v, values):
-        if values.get('type') == CrossSectionType.RECTANGULAR and v is None:
-            raise ValueError('Width is required for rectangular cross section')
-        return v
-    
-    @validator('height')
-    def validate_height(cls, v, values):
-        if values.get('type') == CrossSectionType.RECTANGULAR and v is None:
-            raise ValueError('Height is required for rectangular cross section')
-        return v
-    
-    @validator('diameter')
-    def validate_diameter(cls, v, values):
-        if values.get('type') == CrossSectionType.CIRCULAR and v is None:
+    @model_validator(mode='after')
+    def validate_dimensions(self):
+        if self.type == CrossSectionType.RECTANGULAR:
+            if self.width is None:
+                raise ValueError('Width is required for rectangular cross section')
+            if self.height is None:
+                raise ValueError('Height is required for rectangular cross section')
+        elif self.type == CrossSectionType.CIRCULAR and self.diameter is None:
             raise ValueError('Diameter is required for circular cross section')
-        return v
+        return self
 
 # Material Model
 class Material(BaseModel):
@@ -81,35 +77,33 @@ class SupportReactions(BaseModel):
     horizontal: bool = Field(False, description="รับแรงในแนวนอน")
     moment: bool = Field(False, description="รับโมเมนต์")
 
+# (vertical, horizontal, moment) reactions provided by each support type
+_REACTIONS = {
+    SupportType.PIN: (True, True, False),
+    SupportType.ROLLER: (True, False, False),
+    SupportType.FIXED: (True, True, True),
+}
+
 class Support(BaseModel):
     position: float = Field(..., ge=0, description="ตำแหน่งจากจุดเริ่มต้น (m)")
     type: SupportType
     reactions: SupportReactions
     
-    @validator('reactions')
-    def validate_reactions(cls, v, values):
-        support_type = values.get('type')
-        if support_type == SupportType.PIN:
-            v.vertical = True
-            v.horizontal = True
-            v.moment = False
-        elif support_type == SupportType.ROLLER:
-            v.vertical = True
-            v.horizontal = False
-            v.moment = False
-        elif support_type == SupportType.FIXED:
-            v.vertical = True
-            v.horizontal = True
-            v.moment = True
-        return v
+    @model_validator(mode='after')
+    def validate_reactions(self):
+        # build a new object: the given SupportReactions may be shared with other supports
+        vertical, horizontal, moment = _REACTIONS[self.type]
+        self.reactions = SupportReactions(vertical=vertical, horizontal=horizontal, moment=moment)
+        return self
 
 class SupportConditions(BaseModel):
     type: BeamType
-    supports: List[Support] = Field(..., min_items=1, description="รายการจุดรองรับ")
+    supports: List[Support] = Field(..., min_length=1, description="รายการจุดรองรับ")
     
-    @validator('supports')
-    def validate_supports(cls, v, values):
-        beam_type = values.get('type')
+    @field_validator('supports')
+    @classmethod
+    def validate_supports(cls, v, info: ValidationInfo):
+        beam_type = info.data.get('type')
         
         if beam_type == BeamType.SIMPLY_SUPPORTED and len(v) != 2:
             raise ValueError('Simply supported beam requires exactly 2 supports')
@@ -129,10 +123,17 @@ class SupportConditions(BaseModel):
 # Load Models
 class PointLoad(BaseModel):
     type: Literal[LoadType.POINT] = LoadType.POINT
-    magnitude: float = Field(..., ne=0, description="ขนาดแรง (N)")
+    magnitude: float = Field(..., description="ขนาดแรง (N)")
     position: float = Field(..., ge=0, description="ตำแหน่ง (m)")
     direction: Direction = Direction.DOWN
     angle: Optional[float] = Field(0, ge=0, le=360, description="มุมเอียง (degrees)")
+    
+    @field_validator('magnitude')
+    @classmethod
+    def validate_magnitude(cls, v):
+        if v == 0:
+            raise ValueError('Magnitude must not be zero')
+        return v
 
 class DistributedLoad(BaseModel):
     type: Literal[LoadType.DISTRIBUTED] = LoadType.DISTRIBUTED
@@ -142,24 +143,44 @@ class DistributedLoad(BaseModel):
     end_position: float = Field(..., ge=0, description="ตำแหน่งสิ้นสุด (m)")
     direction: Direction = Direction.DOWN
     
-    @validator('end_position')
-    def validate_positions(cls, v, values):
-        start_pos = values.get('start_position')
+    @field_validator('end_position')
+    @classmethod
+    def validate_positions(cls, v, info: ValidationInfo):
+        start_pos = info.data.get('start_position')
         if start_pos is not None and v <= start_pos:
             raise ValueError('End position must be greater than start position')
         return v
 
 class MomentLoad(BaseModel):
     type: Literal[LoadType.MOMENT] = LoadType.MOMENT
-    magnitude: float = Field(..., ne=0, description="ขนาดโมเมนต์ (N⋅m)")
+    magnitude: float = Field(..., description="ขนาดโมเมนต์ (N⋅m)")
     position: float = Field(..., ge=0, description="ตำแหน่ง (m)")
     direction: Direction = Direction.CLOCKWISE
+    
+    @field_validator('magnitude')
+    @classmethod
+    def validate_magnitude(cls, v):
+        if v == 0:
+            raise ValueError('Magnitude must not be zero')
+        return v
+
+def _load_type(v):
+    # discriminate on `type`; loads sent without it are point loads, as before
+    t = v.get('type', LoadType.POINT) if isinstance(v, dict) else getattr(v, 'type', LoadType.POINT)
+    return t.value if isinstance(t, LoadType) else t
 
-# Union type for all loads
-Load = Union[PointLoad, DistributedLoad, MomentLoad]
+# Union type for all loads, discriminated by the `type` field
+Load = Annotated[
+    Union[
+        Annotated[PointLoad, Tag(LoadType.POINT.value)],
+        Annotated[DistributedLoad, Tag(LoadType.DISTRIBUTED.value)],
+        Annotated[MomentLoad, Tag(LoadType.MOMENT.value)],
+    ],
+    Discriminator(_load_type),
+]
 
 class LoadConditions(BaseModel):
-    loads: List[Load] = Field(..., min_items=1, description="รายการแรงกระทำ")
+    loads: List[Load] = Field(..., min_length=1, description="รายการแรงกระทำ")
 
 # Analysis Options
 class AnalysisOptions(BaseModel):
@@ -179,9 +200,10 @@ class AnalysisRequest(BaseModel):
     loads: LoadConditions
     analysis_options: AnalysisOptions = Field(default_factory=AnalysisOptions)
     
-    @validator('loads')
-    def validate_load_positions(cls, v, values):
-        beam = values.get('beam')
+    @field_validator('loads')
+    @classmethod
+    def validate_load_positions(cls, v, info: ValidationInfo):
+        beam = info.data.get('beam')
         if beam:
             beam_length = beam.length
             for load in v.loads:
@@ -191,9 +213,10 @@ class AnalysisRequest(BaseModel):
                     raise ValueError(f'Load end position {load.end_position} exceeds beam length {beam_length}')
         return v
     
-    @validator('supports')
-    def validate_support_positions(cls, v, values):
-        beam = values.get('beam')
+    @field_validator('supports')
+    @classmethod
+    def validate_support_positions(cls, v, info: ValidationInfo):
+        beam = info.data.get('beam')
         if beam:
             beam_length = beam.length
             for support in v.supports:
@@ -202,24 +225,49 @@ class AnalysisRequest(BaseModel):
         return v
 
 # Result Models
-class DataPoint(BaseModel):
-    position: float = Field(..., description="ตำแหน่งตามแนวคาน (m)")
-    value: float = Field(..., description="ค่าที่คำนวณได้")
+# Small value objects created in bulk per analysis are frozen slotted dataclasses
+# (no per-instance __dict__); pydantic still validates and serializes them as fields.
+@dataclass(frozen=True, slots=True)
+class DataPoint:
+    position: Annotated[float, Field(description="ตำแหน่งตามแนวคาน (m)")]
+    value: Annotated[float, Field(description="ค่าที่คำนวณได้")]
+    unit: Annotated[str, Field(description="หน่วย")]
+
+class DataSeries(BaseModel):
+    """ชุดข้อมูลตามแนวคานแบบ SoA: ตำแหน่งและค่าเก็บเป็นอาร์เรย์แยกกัน"""
+    positions: List[float] = Field(..., description="ตำแหน่งตามแนวคาน (m)")
+    values: List[float] = Field(..., description="ค่าที่คำนวณได้")
     unit: str = Field(..., description="หน่วย")
+    
+    @field_validator('positions', 'values', mode='before')
+    @classmethod
+    def convert_arrays(cls, v):
+        # numpy arrays are converted in one C-level call instead of per element
+        return v.tolist() if hasattr(v, 'tolist') else v
+    
+    @field_validator('values')
+    @classmethod
+    def validate_length(cls, v, info: ValidationInfo):
+        positions = info.data.get('positions')
+        if positions is not None and len(positions) != len(v):
+            raise ValueError('positions and values must have the same length')
+        return v
 
-class Reaction(BaseModel):
+@dataclass(frozen=True, slots=True)
+class Reaction:
     support_id: str
     position: float
-    vertical_force: float = Field(..., description="แรงปฏิกิริยาในแนวตั้ง (N)")
-    horizontal_force: float = Field(..., description="แรงปฏิกิริยาในแนวนอน (N)")
-    moment: float = Field(..., description="โมเมนต์ปฏิกิริยา (N⋅m)")
+    vertical_force: Annotated[float, Field(description="แรงปฏิกิริยาในแนวตั้ง (N)")]
+    horizontal_force: Annotated[float, Field(description="แรงปฏิกิริยาในแนวนอน (N)")]
+    moment: Annotated[float, Field(description="โมเมนต์ปฏิกิริยา (N⋅m)")]
 
-class CriticalPoint(BaseModel):
+@dataclass(frozen=True, slots=True)
+class CriticalPoint:
     position: float
     type: Literal['moment', 'shear', 'deflection', 'stress']
     actual_value: float
     allowable_value: float
-    utilization_ratio: float = Field(..., ge=0, le=1, description="อัตราส่วนการใช้งาน (0-1)")
+    utilization_ratio: Annotated[float, Field(ge=0, le=1, description="อัตราส่วนการใช้งาน (0-1)")]
     severity: Literal['low', 'medium', 'high', 'critical']
 
 class SafetyAnalysis(BaseModel):
@@ -229,7 +277,8 @@ class SafetyAnalysis(BaseModel):
     warnings: List[str]
     recommendations: List[str]
 
-class MaxValues(BaseModel):
+@dataclass(frozen=True, slots=True)
+class MaxValues:
     value: float
     position: float
 
@@ -244,10 +293,10 @@ class AnalysisResults(BaseModel):
     
     # ผลการคำนวณ
     reactions: List[Reaction]
-    moments: List[DataPoint]
-    shear_forces: List[DataPoint]
-    deflections: List[DataPoint]
-    stresses: List[DataPoint]
+    moments: DataSeries
+    shear_forces: DataSeries
+    deflections: DataSeries
+    stresses: DataSeries
     
     # ค่าสูงสุด/ต่ำสุด
     max_moment: MaxValues